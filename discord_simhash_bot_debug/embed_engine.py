@@ -1,12 +1,131 @@
+import os
+from typing import List
+
+def _thread_count() -> int:
+    """Top-level thread count from OMP_NUM_THREADS ("4", nested "4,2"), else os.cpu_count()."""
+    try:
+        n = int(os.environ.get("OMP_NUM_THREADS", "").split(",")[0])
+    except ValueError:
+        n = 0
+    return n if n > 0 else (os.cpu_count() or 1)
+
+# Thread pools read these when torch/onnxruntime load, so set them before any import.
+# An explicit OMP_NUM_THREADS from the environment still wins.
+N_THREADS = _thread_count()
+if not os.environ.get("OMP_NUM_THREADS"):
+    os.environ["OMP_NUM_THREADS"] = str(N_THREADS)
+os.environ.setdefault("MKL_NUM_THREADS", str(N_THREADS))
+
 import numpy as np
-from sentence_transformers import SentenceTransformer
 
-_model = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+# exported + int8-quantized model is cached next to this file, not in the working directory
+ONNX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_model")
+ONNX_FILE = "model_quantized.onnx"
+MAX_SEQ_LEN = 256  # same truncation as SentenceTransformer uses for MiniLM
+
+# EMBED_BACKEND=torch forces the fp32 SentenceTransformer even when optimum is installed
+# (e.g. to compare both backends with evaluate.py).
+_USE_ONNX = False
+if os.environ.get("EMBED_BACKEND", "onnx").lower() != "torch":
+    try:
+        import onnxruntime as ort
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from transformers import AutoTokenizer
+        _USE_ONNX = True
+    except ImportError:
+        pass
+if not _USE_ONNX:
+    # optimum/onnxruntime not installed (or not wanted) -> plain PyTorch SentenceTransformer
+    import torch
+    from sentence_transformers import SentenceTransformer
+    torch.set_num_threads(N_THREADS)
+    torch.set_grad_enabled(False)
+
+try:
+    import simsimd  # AVX-512/NEON dot kernels tuned for small vectors
+except ImportError:
+    simsimd = None
+
+def _export_onnx():
+    """Export MiniLM to ONNX once and quantize it to int8 (dynamic)."""
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_NAME, export=True)
+    quantizer = ORTQuantizer.from_pretrained(model)
+    qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=ONNX_DIR, quantization_config=qconfig)
+    AutoTokenizer.from_pretrained(MODEL_NAME).save_pretrained(ONNX_DIR)
+
+if _USE_ONNX:
+    if not os.path.exists(os.path.join(ONNX_DIR, ONNX_FILE)):
+        _export_onnx()
+    _tokenizer = AutoTokenizer.from_pretrained(ONNX_DIR)
+    _opts = ort.SessionOptions()
+    _opts.intra_op_num_threads = N_THREADS
+    _session = ort.InferenceSession(os.path.join(ONNX_DIR, ONNX_FILE), _opts, providers=["CPUExecutionProvider"])
+    _input_names = {i.name for i in _session.get_inputs()}
+    EMBED_DIM = int(_session.get_outputs()[0].shape[-1])
+else:
+    _model = SentenceTransformer("all-MiniLM-L6-v2")
+    EMBED_DIM = int(_model.get_sentence_embedding_dimension())
+
+# The int8 graph does NOT reproduce the fp32 model's vectors exactly, so stored vectors
+# are tagged with the backend that made them and re-embedded when it changes.
+BACKEND = "onnx-int8" if _USE_ONNX else "torch-fp32"
+MODEL_TAG = f"{MODEL_NAME}:{BACKEND}"
+
+def _encode_onnx(texts: List[str]) -> np.ndarray:
+    tok = _tokenizer(texts, padding=True, truncation=True, max_length=MAX_SEQ_LEN, return_tensors="np")
+    feeds = {k: v.astype(np.int64) for k, v in tok.items() if k in _input_names}
+    hidden = _session.run(None, feeds)[0]  # (batch, seq, dim)
+
+    # mean pooling over real tokens, then L2-normalize (same as the ST pipeline)
+    mask = tok["attention_mask"][..., None].astype(np.float32)
+    pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+    return pooled
 
 def embed(text: str) -> np.ndarray:
-    v = _model.encode([text], normalize_embeddings=True)[0]
+    return embed_batch([text])[0]
+
+def embed_batch(texts: List[str], batch_size: int = 64) -> np.ndarray:
+    # one encode() call for many texts amortizes the per-call model overhead
+    if not texts:
+        return np.empty((0, EMBED_DIM), dtype=np.float32)
+    if _USE_ONNX:
+        v = np.concatenate([_encode_onnx(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)])
+    else:
+        with torch.inference_mode():
+            v = _model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
     return v.astype(np.float32)
 
 def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
-    # if embeddings are normalized, cosine = dot
-    return float(np.dot(a, b))
+    """Cosine similarity of two L2-normalized vectors (embed() output always is).
+
+    No norms are computed here: passing non-normalized vectors gives a raw dot product.
+    """
+    # if embeddings are normalized, cosine = dot; vdot skips np.dot's generic dispatch
+    if simsimd is not None:
+        return float(simsimd.dot(a, b))
+    return float(np.vdot(a, b))
+
+def cosine_sim_many(M: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Cosine of every row of M (n, dim) against v (dim,); same unit-norm precondition as cosine_sim.
+
+    M may be float16 (the storage format); v is cast to match and the result is float32.
+    """
+    if simsimd is not None and len(M):
+        v = v.astype(M.dtype, copy=False)
+        return np.asarray(simsimd.cdist(v[None], M, metric="dot"), dtype=np.float32)[0]
+    # Fallback only: NumPy has no fp16 BLAS, and its fp16 matvec is ~25x slower than
+    # upcasting. The float32 copy of M is made on every call, so this path does NOT get
+    # fp16's bandwidth savings -- install simsimd for that.
+    return M.astype(np.float32, copy=False) @ v.astype(np.float32, copy=False)
+
+def cosine_sim_matrix(Q: np.ndarray, M: np.ndarray) -> np.ndarray:
+    """All-pairs cosine: rows of Q (nq, dim) against rows of M (n, dim) -> (nq, n) float32."""
+    if simsimd is not None and len(Q) and len(M):
+        Q = Q.astype(M.dtype, copy=False)
+        return np.asarray(simsimd.cdist(Q, M, metric="dot"), dtype=np.float32)
+    # same float32-upcast fallback as cosine_sim_many (no fp16 bandwidth savings)
+    return Q.astype(np.float32, copy=False) @ M.astype(np.float32, copy=False).T
@@ -1,5 +1,6 @@
 import json
 import time
+from embed_engine import MODEL_TAG, embed_batch
 from qa_store import QAStore
 
 DATASET_FILE = "eval_dataset.json"
@@ -14,10 +15,11 @@ def main():
     store = QAStore()
 
     # Clear existing data (important for clean evaluation)
-    store.questions.clear()
-    store.answers.clear()
-    store.answers_by_qid.clear()
-    store.recent_q_by_channel.clear()
+    store.clear()
+
+    # Embed all questions and answers up front (batched), then insert
+    q_vecs = embed_batch([qa["question"] for qa in dataset])
+    a_vecs = embed_batch([qa["answer"] for qa in dataset])
 
     # Insert all questions and answers
     for i, qa in enumerate(dataset):
@@ -29,7 +31,8 @@ def main():
             channel_id=0,
             author_id=0,
             text=qa["question"],
-            ts=time.time()
+            ts=time.time(),
+            vec=q_vecs[i]
         )
 
         store.add_answer(
@@ -38,15 +41,18 @@ def main():
             author_id=0,
             text=qa["answer"],
             reply_to_msg_id=qid,
-            ts=time.time()
+            ts=time.time(),
+            vec=a_vecs[i]
         )
 
     TP = FP = FN = 0
 
-    # Query with the original questions (you can later paraphrase)
-    for qa in dataset:
-        results = store.search_questions(qa["question"], top_k=1, min_sim=0.75)
+    # Query with the original questions (you can later paraphrase), all in one batch
+    t0 = time.perf_counter()
+    all_results = store.batch_search_questions([qa["question"] for qa in dataset], top_k=1, min_sim=0.75)
+    query_ms = (time.perf_counter() - t0) * 1000
 
+    for qa, results in zip(dataset, all_results):
         if not results:
             FN += 1
             continue
@@ -62,11 +68,12 @@ def main():
     recall = TP / (TP + FN) if TP + FN > 0 else 0
     f1 = (2 * precision * recall / (precision + recall)) if precision + recall > 0 else 0
 
-    print("Evaluation results:")
+    print(f"Evaluation results ({MODEL_TAG}):")
     print(f"Precision: {precision:.3f}")
     print(f"Recall:    {recall:.3f}")
     print(f"F1-score:  {f1:.3f}")
     print(f"TP={TP}, FP={FP}, FN={FN}")
+    print(f"Query time: {query_ms:.1f} ms for {len(dataset)} questions")
 
 if __name__ == "__main__":
     main()
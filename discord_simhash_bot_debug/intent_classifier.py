@@ -1,10 +1,11 @@
 import math
 import re
+from functools import lru_cache
 from dataclasses import dataclass
-from typing import List, Literal, Tuple
+from typing import Literal, Tuple
 
 import numpy as np
-from embed_engine import embed, cosine_sim
+from embed_engine import embed, embed_batch, cosine_sim_many
 
 Label = Literal["question", "answer", "other"]
 
@@ -12,7 +13,7 @@ Label = Literal["question", "answer", "other"]
 class IntentResult:
     label: Label
     confidence: float
-    sims: Tuple[float, float, float]  # (score_q, score_a, score_o)
+    sims: Tuple[float, float, float]  # (score_q, score_a, score_o); lexical priors only on the fast path
 
 class IntentClassifier:
     """Embedding-space intent classification with multiple prototypes + light lexical features.
@@ -28,6 +29,9 @@ class IntentClassifier:
       - label in {question, answer, other}
       - confidence (softmax probability)
       - raw class scores (q,a,o) for debugging/reporting
+
+    Trivial messages (short reactions, emoji, bare links) skip the embedding: they
+    are labelled "other", and sims/confidence come from the lexical priors alone.
     """
     def __init__(self):
         # Prototype sets: keep them short + varied.
@@ -59,12 +63,21 @@ class IntentClassifier:
             "ok",
         ]
 
-        self.p_questions = [embed(s) for s in q_phrases]
-        self.p_answers = [embed(s) for s in a_phrases]
-        self.p_other = [embed(s) for s in o_phrases]
+        # Embed all prototypes in one batch, then slice per class
+        all_vecs = embed_batch(q_phrases + a_phrases + o_phrases)
+        n_q, n_a = len(q_phrases), len(a_phrases)
+        # One contiguous (P, dim) fp16 matrix per class -> scoring is a single matvec
+        # (only the top-3 ranking matters, which fp16 doesn't change)
+        self.P_q = np.ascontiguousarray(all_vecs[:n_q], dtype=np.float16)
+        self.P_a = np.ascontiguousarray(all_vecs[n_q:n_q + n_a], dtype=np.float16)
+        self.P_o = np.ascontiguousarray(all_vecs[n_q + n_a:], dtype=np.float16)
 
         # Precompile regex for speed
         self._re_qword = re.compile(r"^(how|what|why|where|when|who|which|can|could|should|do|does|did|is|are|am|will|would)\b", re.I)
+        self._re_url_only = re.compile(r"^https?://\S+$", re.I)
+
+        # Users repeat phrases a lot ("thanks", "same issue") -> memoize per text
+        self._classify_cached = lru_cache(maxsize=4096)(self._classify)
 
     @staticmethod
     def _softmax3(a: float, b: float, c: float) -> Tuple[float, float, float]:
@@ -74,17 +87,13 @@ class IntentClassifier:
         return (ea / s, eb / s, ec / s)
 
     @staticmethod
-    def _topk_mean(values: List[float], k: int = 3) -> float:
-        if not values:
-            return -1e9
-        values = sorted(values, reverse=True)
-        k = min(k, len(values))
-        return float(sum(values[:k]) / k)
-
-    def _proto_score(self, v: np.ndarray, protos: List[np.ndarray]) -> float:
-        sims = [cosine_sim(v, p) for p in protos]
+    def _proto_score(v: np.ndarray, P: np.ndarray, k: int = 3) -> float:
+        # v is normalized, so P @ v gives cosine to every prototype at once
+        sims = cosine_sim_many(P, v)
+        k = min(k, sims.shape[0])
         # Using mean of top-3 is smoother than max and reduces weird flips
-        return self._topk_mean(sims, k=3)
+        top = np.partition(sims, -k)[-k:]
+        return float(top.mean())
 
     def _lexical_prior(self, text: str) -> Tuple[float, float, float]:
         """Small, explainable lexical nudges (NOT the main decision)."""
@@ -111,17 +120,35 @@ class IntentClassifier:
 
         return (q_prior, a_prior, o_prior)
 
-    def classify(self, text: str) -> IntentResult:
-        v = embed(text)
+    def _is_trivial(self, text: str, pq: float, po: float) -> bool:
+        """Messages where the lexical evidence alone says "other" (no embedding needed)."""
+        t = text.strip()
+        # very short reaction ("ok", "lol", "ty") that doesn't look like a question
+        if po >= 0.10 and pq == 0.0:
+            return True
+        # pure emoji / punctuation, or a bare link
+        return not any(c.isalnum() for c in t) or bool(self._re_url_only.match(t))
 
-        # Prototype-based scores
-        s_q = self._proto_score(v, self.p_questions)
-        s_a = self._proto_score(v, self.p_answers)
-        s_o = self._proto_score(v, self.p_other)
+    def classify(self, text: str) -> IntentResult:
+        return self._classify_cached(text)
 
+    def _classify(self, text: str) -> IntentResult:
         # Lexical priors
         pq, pa, po = self._lexical_prior(text)
 
+        # Fast path: skip the transformer entirely for trivial messages
+        if self._is_trivial(text, pq, po):
+            # no prototype term here: sims are the priors, confidence is their softmax for "other"
+            _, _, p_o = self._softmax3(pq, pa, po)
+            return IntentResult("other", float(p_o), (float(pq), float(pa), float(po)))
+
+        v = embed(text)
+
+        # Prototype-based scores
+        s_q = self._proto_score(v, self.P_q)
+        s_a = self._proto_score(v, self.P_a)
+        s_o = self._proto_score(v, self.P_o)
+
         # Combine: proto dominates; lexical only nudges
         score_q = s_q + pq
         score_a = s_a + pa
@@ -1,18 +1,18 @@
 from hashlib import md5
 
+import numpy as np
+
 def simhash(text):
     bits = 64
-    v = [0] * bits
-    for word in text.lower().split():
-        h = int(md5(word.encode()).hexdigest(), 16)
-        for i in range(bits):
-            bit = (h >> i) & 1
-            v[i] += 1 if bit == 1 else -1
-    fingerprint = 0
-    for i in range(bits):
-        if v[i] > 0:
-            fingerprint |= 1 << i
-    return fingerprint
+    words = text.lower().split()
+    if not words:
+        return 0
+    # low 64 bits of each word's md5 (last 8 digest bytes, big-endian) -> one uint64 per word
+    h = np.frombuffer(b"".join(md5(w.encode()).digest()[8:] for w in words), dtype=">u8")
+    # (n_words, 64) bit matrix, column i = bit i of each hash
+    word_bits = np.unpackbits(h.astype("<u8").view(np.uint8), bitorder="little").reshape(-1, bits)
+    v = (2 * word_bits.astype(np.int32) - 1).sum(axis=0)
+    return int(np.packbits((v > 0).astype(np.uint8), bitorder="little").view("<u8")[0])
 
 def hamming_distance(x, y):
-    return bin(x ^ y).count("1")
+    return (x ^ y).bit_count()
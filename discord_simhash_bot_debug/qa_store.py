@@ -1,15 +1,35 @@
 import json
+import os
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
 
+import msgpack
 import numpy as np
 
-from embed_engine import embed, cosine_sim
+from embed_engine import MODEL_TAG, embed, embed_batch, cosine_sim_many, cosine_sim_matrix
 from srp_index import SRPIndex
 
-Q_DB = "questions.json"
-A_DB = "answers.json"
+# Append-only metadata logs (a stream of msgpack records) ...
+Q_DB = "questions.msgpack"
+A_DB = "answers.msgpack"
+# ... row-aligned with raw row-major float16 (cap, dim) vector files, opened via np.memmap ...
+Q_VEC = "questions.f16"
+A_VEC = "answers.f16"
+# ... and a small sidecar holding the number of committed rows
+Q_META = "questions.meta.json"
+A_META = "answers.meta.json"
+# Pre-log snapshots (one JSON list, vectors as float lists); imported once if the logs don't exist yet
+LEGACY_Q_DB = "questions.json"
+LEGACY_A_DB = "answers.json"
+
+INIT_CAP = 1024  # initial rows of the vector matrices (grown geometrically)
+RECENT_Q_WINDOW = 30  # recent questions per channel considered when linking answers
+# Stored vectors are only used for dot-product ranking, which is stable in fp16;
+# half the bytes to stream per query (and on disk)
+VEC_DTYPE = np.dtype(np.float16)
 
 @dataclass
 class QItem:
@@ -18,7 +38,13 @@ class QItem:
     author_id: int
     text: str
     ts: float
-    vec: np.ndarray
+    row: int  # row of this question's vector in store.Q_mat
+    store: "QAStore" = field(repr=False, compare=False)
+
+    @property
+    def vec(self) -> np.ndarray:
+        # a copy, not a view: Q_mat gets remapped when it grows
+        return np.array(self.store.Q_mat[self.row])
 
 @dataclass
 class AItem:
@@ -27,8 +53,13 @@ class AItem:
     author_id: int
     text: str
     ts: float
-    vec: np.ndarray
+    row: int  # row of this answer's vector in store.A_mat
     qid: int  # linked question msg_id
+    store: "QAStore" = field(repr=False, compare=False)
+
+    @property
+    def vec(self) -> np.ndarray:
+        return np.array(self.store.A_mat[self.row])
 
 class QAStore:
     """
@@ -51,11 +82,17 @@ class QAStore:
         self.answers: List[AItem] = []
         self.answers_by_qid: Dict[int, List[AItem]] = {}
 
+        # Vectors live in contiguous memory-mapped (cap, dim) matrices; items only keep their row
+        # (mapped in _load_all)
+        self.Q_mat: Optional[np.memmap] = None
+        self.A_mat: Optional[np.memmap] = None
+
         # Fast lookup
         self.q_by_id: Dict[int, QItem] = {}
+        self.q_row_by_id: Dict[int, int] = {}
 
         # Recent questions per channel (for linking answers)
-        self.recent_q_by_channel: Dict[int, List[int]] = {}
+        self.recent_q_by_channel: Dict[int, Deque[int]] = {}
 
         # ANN index for questions (embedding space)
         self.q_index = SRPIndex(dim=self.dim, n_planes=n_planes, n_bands=n_bands)
@@ -63,13 +100,151 @@ class QAStore:
         self._load_all()
 
     # ---------- persistence ----------
-    def _load_questions(self) -> List[QItem]:
+    def _open_matrix(self, path: str, n_rows: int) -> np.memmap:
+        """Memory-map `path` as a (cap, dim) VEC_DTYPE matrix holding at least n_rows.
+
+        The file is created or extended with zeros as needed; cap grows geometrically.
+        """
+        row_bytes = self.dim * VEC_DTYPE.itemsize
+        with open(path, "ab") as f:
+            size = f.seek(0, os.SEEK_END)
+            cap = max(INIT_CAP, size // row_bytes)
+            while cap < n_rows:
+                cap *= 2
+            if size < cap * row_bytes:
+                f.truncate(cap * row_bytes)
+        return np.memmap(path, dtype=VEC_DTYPE, mode="r+", shape=(cap, self.dim))
+
+    def _remap(self, attr: str, path: str, n_rows: int):
+        """(Re)map `path` as self.<attr>, growing the file to hold at least n_rows.
+
+        The previous mapping is flushed and released first: Windows refuses to resize
+        a file that is still mapped (WinError 1224), so _open_matrix must not extend
+        the file under a live np.memmap. Dropping the last reference unmaps it; the
+        mmap is not closed explicitly, since that would pull the memory out from under
+        any view still alive (QItem/AItem.vec hand out copies for that reason).
+        """
+        old = getattr(self, attr)
+        if old is not None:
+            old.flush()
+            alive = weakref.ref(old)
+            setattr(self, attr, None)
+            del old
+            if alive() is not None:
+                print(f"warning: {path} is still mapped by an outside view; growing it may fail on Windows")
+        setattr(self, attr, self._open_matrix(path, n_rows))
+
+    def _ensure_capacity(self, attr: str, path: str, n_rows: int):
+        """Grow self.<attr> (geometrically) if it can't hold n_rows."""
+        cap = getattr(self, attr).shape[0]
+        if n_rows > cap:
+            self._remap(attr, path, max(n_rows, 2 * cap))
+
+    @staticmethod
+    def _read_meta(path: str) -> Optional[dict]:
+        """Sidecar contents (n_rows, dim, dtype, model), or None if there is no sidecar."""
         try:
-            raw = json.load(open(Q_DB, "r", encoding="utf-8"))
-        except:
-            return []
+            with open(path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        # sidecars without a dtype were written by the float32 format
+        if meta.get("dtype", "float32") != VEC_DTYPE.name and meta["n_rows"] > 0:
+            raise ValueError(f"{path} describes {meta.get('dtype', 'float32')} vectors, expected {VEC_DTYPE.name}")
+        return meta
+
+    def _write_n_rows(self, path: str, n_rows: int):
+        # write-then-rename so a crash never leaves a torn sidecar behind
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(n_rows=n_rows, dim=self.dim, dtype=VEC_DTYPE.name, model=MODEL_TAG), f)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _read_log(path: str) -> Tuple[List[dict], List[int]]:
+        """All records in the log, plus the file offset just past each one."""
+        records: List[dict] = []
+        ends: List[int] = []
+        try:
+            with open(path, "rb") as f:
+                unpacker = msgpack.Unpacker(f, raw=False)
+                for rec in unpacker:
+                    records.append(rec)
+                    ends.append(unpacker.tell())
+        except FileNotFoundError:
+            pass
+        except (ValueError, msgpack.UnpackException):
+            # torn/garbled tail from a crash mid-append: keep the complete records before it
+            pass
+        # A tail cut short ends iteration silently. Either way, callers truncate the file
+        # at ends[-1] (see _read_committed) before appending again, so a bad tail can't
+        # end up in the middle of the stream.
+        return records, ends
+
+    def _read_committed(self, log_path: str, meta_path: str) -> Tuple[List[dict], bool]:
+        """Records covered by the sidecar's n_rows, and whether their vectors are stale.
+
+        Anything after them was appended without being committed (crash between the
+        log append and the sidecar update); it is cut off the file so the next append
+        lands right after the last committed record and stays row-aligned.
+
+        Vectors are stale when the sidecar names a different embedding model/backend
+        than MODEL_TAG (or none at all); the caller re-embeds them and rewrites the sidecar.
+        """
+        records, ends = self._read_log(log_path)
+        meta = self._read_meta(meta_path)
+        if meta is None:
+            # sidecar lost but the log survived: rebuild it from the complete records
+            # (the caller re-embeds them and writes the new sidecar) instead of dropping history
+            n_rows = len(records)
+            if n_rows:
+                print(f"{meta_path} missing; rebuilding {n_rows} rows from {log_path}")
+            stale = True
+        else:
+            n_rows = int(meta["n_rows"])
+            stale = meta.get("model") != MODEL_TAG
+        n = min(n_rows, len(records))
+        end = ends[n - 1] if n else 0
+        if os.path.exists(log_path) and os.path.getsize(log_path) > end:
+            with open(log_path, "r+b") as f:
+                f.truncate(end)
+        return records[:n], stale
+
+    @staticmethod
+    def _repair_rows(mat: np.memmap, texts: List[str], label: str, stale: bool = False):
+        """Re-embed committed rows whose stored vector isn't unit-norm (or all rows if stale).
+
+        A crash can lose memmap pages that were never written back (they read as
+        zeros); re-embedding the row's text restores it instead of failing the load.
+        Vectors from another model/backend are not comparable with new ones, so a
+        stale store is re-embedded as a whole rather than mixing the two.
+        """
+        n = len(texts)
+        if n == 0:
+            return
+        if stale:
+            bad = np.arange(n)
+        else:
+            sq_norms = np.einsum("nd,nd->n", mat[:n], mat[:n], dtype=np.float32)
+            bad = np.flatnonzero(np.abs(sq_norms - 1.0) >= 1e-3)  # fp16 rounding stays well below
+        if len(bad):
+            mat[bad] = embed_batch([texts[i] for i in bad])
+            mat.flush()
+            print(f"Re-embedded {len(bad)} {'stale' if stale else 'damaged'} {label} vectors with {MODEL_TAG}")
+
+    @staticmethod
+    def _append_log(path: str, entry: dict):
+        with open(path, "ab") as f:
+            f.write(msgpack.packb(entry, use_bin_type=True))
+
+    def _load_questions(self) -> List[QItem]:
+        entries, stale = self._read_committed(Q_DB, Q_META)
+        self._remap("Q_mat", Q_VEC, len(entries))
+        self._repair_rows(self.Q_mat, [e["text"] for e in entries], "question", stale)
+        if stale:
+            self._write_n_rows(Q_META, len(entries))  # vectors are flushed; now tag them
         out: List[QItem] = []
-        for e in raw:
+        for row, e in enumerate(entries):
             out.append(
                 QItem(
                     msg_id=int(e["msg_id"]),
@@ -77,18 +252,20 @@ class QAStore:
                     author_id=int(e["author_id"]),
                     text=e["text"],
                     ts=float(e["ts"]),
-                    vec=np.array(e["vec"], dtype=np.float32),
+                    row=row,
+                    store=self,
                 )
             )
         return out
 
     def _load_answers(self) -> List[AItem]:
-        try:
-            raw = json.load(open(A_DB, "r", encoding="utf-8"))
-        except:
-            return []
+        entries, stale = self._read_committed(A_DB, A_META)
+        self._remap("A_mat", A_VEC, len(entries))
+        self._repair_rows(self.A_mat, [e["text"] for e in entries], "answer", stale)
+        if stale:
+            self._write_n_rows(A_META, len(entries))  # vectors are flushed; now tag them
         out: List[AItem] = []
-        for e in raw:
+        for row, e in enumerate(entries):
             out.append(
                 AItem(
                     msg_id=int(e["msg_id"]),
@@ -96,48 +273,100 @@ class QAStore:
                     author_id=int(e["author_id"]),
                     text=e["text"],
                     ts=float(e["ts"]),
-                    vec=np.array(e["vec"], dtype=np.float32),
+                    row=row,
                     qid=int(e["qid"]),
+                    store=self,
                 )
             )
         return out
 
-    def _save_questions(self):
-        raw = []
-        for q in self.questions:
-            raw.append(
-                dict(
-                    msg_id=q.msg_id,
-                    channel_id=q.channel_id,
-                    author_id=q.author_id,
-                    text=q.text,
-                    ts=q.ts,
-                    vec=q.vec.tolist(),
-                )
-            )
-        json.dump(raw, open(Q_DB, "w", encoding="utf-8"), indent=2)
+    def _append_question(self, q: QItem):
+        # vector row is already in the memmap: write it back to disk, then commit
+        # metadata and finally the row count
+        self.Q_mat.flush()
+        self._append_log(
+            Q_DB,
+            dict(
+                msg_id=q.msg_id,
+                channel_id=q.channel_id,
+                author_id=q.author_id,
+                text=q.text,
+                ts=q.ts,
+            ),
+        )
+        self._write_n_rows(Q_META, len(self.questions))
+
+    def _append_answer(self, a: AItem):
+        self.A_mat.flush()
+        self._append_log(
+            A_DB,
+            dict(
+                msg_id=a.msg_id,
+                channel_id=a.channel_id,
+                author_id=a.author_id,
+                text=a.text,
+                ts=a.ts,
+                qid=a.qid,
+            ),
+        )
+        self._write_n_rows(A_META, len(self.answers))
+
+    def clear(self):
+        """Drop all questions/answers, in memory and on disk (used by evaluate.py)."""
+        for path in (Q_DB, A_DB):
+            with open(path, "wb"):
+                pass
+        # vector files keep their size; stale rows are simply overwritten
+        self._write_n_rows(Q_META, 0)
+        self._write_n_rows(A_META, 0)
+        self._load_all()
 
-    def _save_answers(self):
-        raw = []
-        for a in self.answers:
-            raw.append(
-                dict(
-                    msg_id=a.msg_id,
-                    channel_id=a.channel_id,
-                    author_id=a.author_id,
-                    text=a.text,
-                    ts=a.ts,
-                    vec=a.vec.tolist(),
-                    qid=a.qid,
-                )
+    @staticmethod
+    def _read_legacy(path: str) -> List[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def _import_legacy_json(self):
+        """Carry over history from the old questions.json/answers.json format.
+
+        The stored legacy vectors came from whatever model wrote them; the texts are
+        re-embedded so the store never mixes vectors from two models.
+        """
+        legacy_q = self._read_legacy(LEGACY_Q_DB)
+        q_vecs = embed_batch([e["text"] for e in legacy_q])
+        for e, v in zip(legacy_q, q_vecs):
+            self.add_question(
+                msg_id=int(e["msg_id"]),
+                channel_id=int(e["channel_id"]),
+                author_id=int(e["author_id"]),
+                text=e["text"],
+                ts=float(e["ts"]),
+                vec=v,
+            )
+        # only keep answers whose question came along (no re-guessing links)
+        legacy_a = [e for e in self._read_legacy(LEGACY_A_DB) if int(e["qid"]) in self.q_by_id]
+        a_vecs = embed_batch([e["text"] for e in legacy_a])
+        for e, v in zip(legacy_a, a_vecs):
+            self.add_answer(
+                msg_id=int(e["msg_id"]),
+                channel_id=int(e["channel_id"]),
+                author_id=int(e["author_id"]),
+                text=e["text"],
+                reply_to_msg_id=int(e["qid"]),
+                ts=float(e["ts"]),
+                vec=v,
             )
-        json.dump(raw, open(A_DB, "w", encoding="utf-8"), indent=2)
+        print(f"Imported {len(self.questions)} questions / {len(legacy_a)} answers from {LEGACY_Q_DB}, {LEGACY_A_DB}")
 
     def _load_all(self):
         self.questions = self._load_questions()
         self.answers = self._load_answers()
 
         self.q_by_id = {q.msg_id: q for q in self.questions}
+        self.q_row_by_id = {q.msg_id: q.row for q in self.questions}
 
         self.answers_by_qid.clear()
         for a in self.answers:
@@ -145,25 +374,55 @@ class QAStore:
 
         self.recent_q_by_channel.clear()
         for q in self.questions:
-            self.recent_q_by_channel.setdefault(q.channel_id, []).append(q.msg_id)
+            self._remember_question(q.channel_id, q.msg_id)
 
         # rebuild ANN index from disk
         self.q_index = SRPIndex(dim=self.dim, n_planes=self.q_index.n_planes, n_bands=self.q_index.n_bands)
-        for q in self.questions:
-            self.q_index.add(int(q.msg_id), q.vec)
+        self.q_index.bulk_add([q.msg_id for q in self.questions], self.Q_mat[:len(self.questions)])
+
+        if not os.path.exists(Q_DB) and os.path.exists(LEGACY_Q_DB):
+            self._import_legacy_json()
+
+    def _remember_question(self, channel_id: int, msg_id: int):
+        recent = self.recent_q_by_channel.get(channel_id)
+        if recent is None:
+            # bounded: O(1) append, oldest question drops out automatically
+            recent = self.recent_q_by_channel[channel_id] = deque(maxlen=RECENT_Q_WINDOW)
+        recent.append(msg_id)
 
     # ---------- question API ----------
-    def add_question(self, msg_id: int, channel_id: int, author_id: int, text: str, ts: Optional[float] = None):
+    def add_question(
+        self,
+        msg_id: int,
+        channel_id: int,
+        author_id: int,
+        text: str,
+        ts: Optional[float] = None,
+        vec: Optional[np.ndarray] = None,
+    ):
         ts = ts if ts is not None else time.time()
-        v = embed(text)
-
-        q = QItem(msg_id=msg_id, channel_id=channel_id, author_id=author_id, text=text, ts=ts, vec=v)
+        # Callers that already embedded the text in a batch can pass it in
+        v = np.ascontiguousarray(vec if vec is not None else embed(text), dtype=np.float32)
+        if __debug__:
+            # every scoring path uses raw dot products, which is only cosine for unit vectors
+            assert abs(np.dot(v, v) - 1.0) < 1e-4, "question vector must be L2-normalized"
+
+        # index first: SRPIndex rejects non-normalized vectors before anything is stored.
+        # Hash the stored (VEC_DTYPE) vector, which is what _load_all rebuilds the index
+        # from, so bucket membership doesn't change across restarts.
+        self.q_index.add(int(msg_id), v.astype(VEC_DTYPE))
+
+        row = len(self.questions)
+        self._ensure_capacity("Q_mat", Q_VEC, row + 1)
+        self.Q_mat[row] = v
+
+        q = QItem(msg_id=msg_id, channel_id=channel_id, author_id=author_id, text=text, ts=ts, row=row, store=self)
         self.questions.append(q)
         self.q_by_id[msg_id] = q
-        self.recent_q_by_channel.setdefault(channel_id, []).append(msg_id)
+        self.q_row_by_id[msg_id] = row
+        self._remember_question(channel_id, msg_id)
 
-        self.q_index.add(int(msg_id), v)
-        self._save_questions()
+        self._append_question(q)
 
     def search_questions(self, text: str, top_k: int = 5, min_sim: float = 0.75) -> List[Tuple[QItem, float]]:
         if len(self.questions) == 0:
@@ -171,55 +430,75 @@ class QAStore:
 
         qv = embed(text)
 
-        # 1) ANN candidate retrieval
-        cand_ids = self.q_index.candidates(qv)
-
-        # Safety fallback: for tiny datasets or if no bucket hit, scan all
-        if not cand_ids or len(self.questions) <= 200:
+        # Very early startup: exact scan is cheaper than probing the index
+        if len(self.questions) < 50:
             cand_ids = list(self.q_by_id.keys())
+        else:
+            # 1) ANN candidate retrieval (multi-probe SRP)
+            cand_ids = self.q_index.candidates(qv)
 
-        # 2) Exact re-ranking by cosine
-        scored: List[Tuple[QItem, float]] = []
-        for mid in cand_ids:
-            qi = self.q_by_id.get(int(mid))
-            if qi is None:
-                continue
-            sim = cosine_sim(qv, qi.vec)
-            if sim >= min_sim:
-                scored.append((qi, float(sim)))
+            # No bucket hit: shortlist by Hamming distance of the full 64-bit signatures
+            if not cand_ids:
+                cand_ids = self.q_index.nearest_by_hamming(qv, k=32)
 
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[:top_k]
+        # 2) Exact re-ranking by cosine: one batched dot over the candidate rows
+        ids = [int(mid) for mid in cand_ids if int(mid) in self.q_row_by_id]
+        if not ids:
+            return []
+        rows = np.fromiter((self.q_row_by_id[mid] for mid in ids), dtype=np.intp, count=len(ids))
+        sims = cosine_sim_many(self.Q_mat[rows], qv)
+
+        k = min(top_k, len(ids))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return [(self.q_by_id[ids[i]], float(sims[i])) for i in top if sims[i] >= min_sim]
+
+    def batch_search_questions(
+        self, texts: List[str], top_k: int = 5, min_sim: float = 0.75
+    ) -> List[List[Tuple[QItem, float]]]:
+        """Like search_questions for many queries at once.
+
+        Skips the ANN index: all queries are embedded in one batch and scored
+        exactly against every stored question with a single matmul.
+        """
+        n = len(self.questions)
+        if n == 0 or not texts:
+            return [[] for _ in texts]
+
+        S = cosine_sim_matrix(embed_batch(texts), self.Q_mat[:n])  # (len(texts), n)
+
+        k = min(top_k, n)
+        top = np.argpartition(-S, k - 1, axis=1)[:, :k]
+        out: List[List[Tuple[QItem, float]]] = []
+        for sims, rows in zip(S, top):
+            rows = rows[np.argsort(-sims[rows])]
+            out.append([(self.questions[r], float(sims[r])) for r in rows if sims[r] >= min_sim])
+        return out
 
     # ---------- answer API ----------
-    def _time_decay(self, dt_seconds: float, tau: float = 300.0) -> float:
-        return float(np.exp(-dt_seconds / tau))
+    def _time_decay(self, dt_seconds: np.ndarray, tau: float = 300.0) -> np.ndarray:
+        return np.exp(-dt_seconds / tau)
 
     def _link_answer(self, answer_vec: np.ndarray, channel_id: int, ts: float) -> Optional[int]:
         # Search among the most recent questions in this channel
-        candidates = self.recent_q_by_channel.get(channel_id, [])[-30:]  # last 30 questions
+        candidates = self.recent_q_by_channel.get(channel_id, ())  # last RECENT_Q_WINDOW questions
 
-        best_qid = None
-        best_score = -1e9
-
-        for qid in reversed(candidates):
-            q = self.q_by_id.get(int(qid))
-            if q is None:
-                continue
-
-            sim = cosine_sim(answer_vec, q.vec)
-            dt = abs(ts - q.ts)
+        # newest first, so argmax keeps preferring the most recent question on ties
+        qids = [int(qid) for qid in reversed(candidates) if int(qid) in self.q_row_by_id]
+        if not qids:
+            return None
 
-            # Hybrid score: similarity + recency (explainable + robust)
-            score = 0.7 * sim + 0.3 * self._time_decay(dt)
+        rows = [self.q_row_by_id[qid] for qid in qids]
+        sims = cosine_sim_many(self.Q_mat[rows], answer_vec)
+        dt = np.abs(ts - np.array([self.q_by_id[qid].ts for qid in qids]))
 
-            if score > best_score:
-                best_score = score
-                best_qid = int(qid)
+        # Hybrid score: similarity + recency (explainable + robust)
+        scores = 0.7 * sims + 0.3 * self._time_decay(dt)
+        best = int(np.argmax(scores))
 
         # Require a minimum combined score (prevents dumb links)
-        if best_qid is not None and best_score >= 0.55:
-            return best_qid
+        if scores[best] >= 0.55:
+            return qids[best]
         return None
 
     def add_answer(
@@ -230,9 +509,12 @@ class QAStore:
         text: str,
         reply_to_msg_id: Optional[int] = None,
         ts: Optional[float] = None,
+        vec: Optional[np.ndarray] = None,
     ) -> Optional[int]:
         ts = ts if ts is not None else time.time()
-        v = embed(text)
+        v = np.ascontiguousarray(vec if vec is not None else embed(text), dtype=np.float32)
+        if __debug__:
+            assert abs(np.dot(v, v) - 1.0) < 1e-4, "answer vector must be L2-normalized"
 
         # If user replied directly to a known question, link exactly.
         if reply_to_msg_id is not None and int(reply_to_msg_id) in self.q_by_id:
@@ -244,10 +526,14 @@ class QAStore:
         if qid is None:
             return None
 
-        a = AItem(msg_id=msg_id, channel_id=channel_id, author_id=author_id, text=text, ts=ts, vec=v, qid=qid)
+        row = len(self.answers)
+        self._ensure_capacity("A_mat", A_VEC, row + 1)
+        self.A_mat[row] = v
+
+        a = AItem(msg_id=msg_id, channel_id=channel_id, author_id=author_id, text=text, ts=ts, row=row, qid=qid, store=self)
         self.answers.append(a)
         self.answers_by_qid.setdefault(qid, []).append(a)
-        self._save_answers()
+        self._append_answer(a)
         return qid
 
     def get_best_answer(self, q: QItem, max_len: int = 800) -> Optional[str]:
@@ -256,16 +542,8 @@ class QAStore:
             return None
 
         # choose answer most aligned to question in embedding space
-        best = None
-        best_sim = -1e9
-        for a in answers:
-            s = cosine_sim(q.vec, a.vec)
-            if s > best_sim:
-                best_sim = s
-                best = a
-
-        if best is None:
-            return None
+        sims = cosine_sim_many(self.A_mat[[a.row for a in answers]], q.vec)
+        best = answers[int(np.argmax(sims))]
 
         txt = best.text.strip()
         if len(txt) > max_len:
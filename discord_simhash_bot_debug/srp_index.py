@@ -7,6 +7,11 @@ class SRPIndex:
     - Builds L random hyperplanes in R^d
     - Signature is L-bit sign(dot(v, r_i))
     - Uses banding to create buckets -> candidate retrieval
+    - Multi-probe queries: also looks up keys with the least certain bits flipped
+    - Keeps the full signature per item as one uint64 for a Hamming-distance fallback
+
+    Indexed vectors must be L2-normalized (add/bulk_add raise ValueError otherwise),
+    so callers can re-rank candidates with plain dot products.
     """
     def __init__(self, dim: int, n_planes: int = 64, n_bands: int = 8, seed: int = 42):
         assert n_planes % n_bands == 0
@@ -14,6 +19,10 @@ class SRPIndex:
         self.n_planes = n_planes
         self.n_bands = n_bands
         self.band_size = n_planes // n_bands
+        assert n_planes <= 64  # full signature must fit in one uint64
+
+        # band key = bits of the band dotted with powers of two (bit i -> 2**i)
+        self._pow2 = np.uint64(1) << np.arange(self.band_size, dtype=np.uint64)
 
         rng = np.random.default_rng(seed)
         self.planes = rng.normal(size=(n_planes, dim)).astype(np.float32)
@@ -21,31 +30,111 @@ class SRPIndex:
         # buckets[band_id][band_key] -> list of item_ids
         self.buckets: List[Dict[int, List[int]]] = [dict() for _ in range(n_bands)]
 
-    def _signature_bits(self, v: np.ndarray) -> np.ndarray:
-        # v assumed normalized; sign(dot) gives bits
+        # full signatures, row-aligned with item ids (grown geometrically)
+        self.n = 0
+        self.sig = np.empty(1024, dtype=np.uint64)
+        self.ids = np.empty(1024, dtype=np.int64)
+
+    @staticmethod
+    def _check_normalized(V: np.ndarray, tol: float = 1e-4):
+        if V.dtype == np.float16:
+            tol = 1e-3  # fp16 rounding alone moves ||v||^2 by up to ~1.5e-4
+        sq_norms = np.einsum("...d,...d->...", V, V, dtype=np.float32)
+        if not np.all(np.abs(sq_norms - 1.0) < tol):
+            raise ValueError("SRPIndex expects L2-normalized vectors")
+
+    def _signature_bits(self, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # sign(dot) gives bits; proj (distance to each hyperplane) is kept for multi-probe
         proj = self.planes @ v  # (n_planes,)
-        return (proj >= 0).astype(np.uint8)
+        return (proj >= 0).astype(np.uint8), proj
+
+    def _band_keys(self, bits: np.ndarray) -> np.ndarray:
+        """Integer key of every band (bit i of a band -> bit i of its key).
 
-    def _band_key(self, bits: np.ndarray, band_id: int) -> int:
-        start = band_id * self.band_size
-        end = start + self.band_size
-        b = bits[start:end]
-        key = 0
-        for i, bit in enumerate(b):
-            key |= (int(bit) << i)
-        return key
+        bits: (..., n_planes) -> keys: (..., n_bands)
+        """
+        bands = bits.reshape(*bits.shape[:-1], self.n_bands, self.band_size)
+        return bands.astype(np.uint64) @ self._pow2
+
+    @staticmethod
+    def _signature(bits: np.ndarray) -> np.ndarray:
+        """Full signature as uint64 (bit i = plane i). bits: (..., n_planes) -> (...)"""
+        packed = np.packbits(bits, axis=-1, bitorder="little")
+        pad = 8 - packed.shape[-1]
+        if pad:
+            packed = np.pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, pad)])
+        return np.ascontiguousarray(packed).view("<u8")[..., 0]
+
+    @staticmethod
+    def _popcount(x: np.ndarray) -> np.ndarray:
+        if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+            return np.bitwise_count(x)
+        return np.unpackbits(x.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+
+    def _append_sigs(self, item_ids: np.ndarray, sigs: np.ndarray):
+        n_new = self.n + len(sigs)
+        if n_new > len(self.sig):
+            cap = len(self.sig)
+            while cap < n_new:
+                cap *= 2
+            self.sig = np.resize(self.sig, cap)
+            self.ids = np.resize(self.ids, cap)
+        self.sig[self.n:n_new] = sigs
+        self.ids[self.n:n_new] = item_ids
+        self.n = n_new
 
     def add(self, item_id: int, v: np.ndarray):
-        bits = self._signature_bits(v)
-        for band in range(self.n_bands):
-            key = self._band_key(bits, band)
+        self._check_normalized(v)
+        bits, _ = self._signature_bits(v)
+        self._append_sigs(np.array([item_id], dtype=np.int64), self._signature(bits)[None])
+
+        keys = self._band_keys(bits)
+        for band, key in enumerate(keys.tolist()):
             self.buckets[band].setdefault(key, []).append(item_id)
 
-    def candidates(self, v: np.ndarray) -> List[int]:
-        bits = self._signature_bits(v)
-        cand = set()
+    def bulk_add(self, item_ids: Iterable[int], V: np.ndarray):
+        """Add many vectors (rows of V) at once: one matmul for all signatures."""
+        ids = np.asarray(list(item_ids), dtype=np.int64)
+        if len(ids) == 0:
+            return
+        self._check_normalized(V)
+        bits = (V @ self.planes.T >= 0).astype(np.uint8)  # (N, n_planes)
+        self._append_sigs(ids, self._signature(bits))
+
+        keys = self._band_keys(bits)  # (N, n_bands)
+
         for band in range(self.n_bands):
-            key = self._band_key(bits, band)
-            for item_id in self.buckets[band].get(key, []):
-                cand.add(item_id)
+            uniq, inv = np.unique(keys[:, band], return_inverse=True)
+            # group ids by key; stable sort keeps insertion order inside each bucket
+            order = np.argsort(inv, kind="stable")
+            groups = np.split(ids[order], np.cumsum(np.bincount(inv))[:-1])
+            for key, group in zip(uniq.tolist(), groups):
+                self.buckets[band].setdefault(key, []).extend(group.tolist())
+
+    def candidates(self, v: np.ndarray, k_probe: int = 2) -> List[int]:
+        """Union of the query's buckets plus, per band, the buckets reached by
+        flipping each of its k_probe lowest-margin bits (|proj| closest to 0)."""
+        bits, proj = self._signature_bits(v)
+        keys = self._band_keys(bits)  # (n_bands,)
+
+        probe_keys = keys[:, None]
+        k = min(k_probe, self.band_size)
+        if k > 0:
+            margins = np.abs(proj).reshape(self.n_bands, self.band_size)
+            flip = np.argpartition(margins, k - 1, axis=1)[:, :k]  # (n_bands, k) bit positions
+            probe_keys = np.concatenate([probe_keys, keys[:, None] ^ self._pow2[flip]], axis=1)
+
+        cand = set()
+        for band, band_keys in enumerate(probe_keys.tolist()):
+            for key in band_keys:
+                for item_id in self.buckets[band].get(key, []):
+                    cand.add(item_id)
         return list(cand)
+
+    def nearest_by_hamming(self, v: np.ndarray, k: int = 32) -> List[int]:
+        """Ids of the k items whose signatures are closest in Hamming distance."""
+        if self.n <= k:
+            return self.ids[:self.n].tolist()
+        q_sig = self._signature(self._signature_bits(v)[0])
+        hd = self._popcount(self.sig[:self.n] ^ q_sig)
+        return self.ids[np.argpartition(hd, k - 1)[:k]].tolist()